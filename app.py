@@ -1,13 +1,17 @@
 import os
+from typing import TYPE_CHECKING
 
 import openai
+import requests
 import streamlit as st
 from dotenv import load_dotenv
-from utils.enums import Providers
 from utils.exceptions import LLMoviesOutputError
-from utils.input import get_best_docs
+from utils.ui import PROVIDER_VALUES, get_provider_name, movie_card, unsafe_html
 from utils.utils import load_css
 
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
 st.set_page_config(
     page_title="LLMovies | Your go-to companion for movie nights",
     page_icon="🍿",
@@ -15,47 +19,60 @@ st.set_page_config(
 )
 
 
-def show_trailer(video: str | None):
-    if video:
-        st.video(f"https://www.youtube.com/watch?v={video}")
-    else:
-        st.video(f"https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+@st.cache_resource(show_spinner=False)
+def init_env() -> bool:
+    # .env only needs to be read from disk once per process, not per rerun.
+    load_dotenv()
+    return True
+
+
+@st.cache_resource(show_spinner=False)
+def warm_weaviate() -> bool:
+    # Pay the cold-start cost (TLS, auth, shard open) once at launch
+    # instead of in front of the first user query. Best effort only.
+    try:
+        from utils.weaviate_client import get_client
 
+        get_client().query.get("Movie", ["title"]).with_limit(1).do()
+        return True
+    except Exception:
+        return False
 
-def get_provider_name(provider_id: str):
-    return Providers(provider_id).name
 
+@st.cache_resource(show_spinner=False)
+def get_openai_session() -> requests.Session:
+    # Without a shared session the openai client opens a fresh connection
+    # per request, paying a TLS handshake every call.
+    return requests.Session()
 
-def unsafe_html(html: str) -> st._DeltaGenerator:
-    return st.markdown(html, unsafe_allow_html=True)
 
+PRESET_QUERIES = (
+    "I'd like to watch a movie about friendship with a rating higher than 7.0.",
+    "Can you recommend a comedy located in Italy released after 2015.0?",
+    "Do you know any thrillers with a rating higher than 8.0 and more than 1000.0 reviews?",
+)
 
-def genre_tags(genres: list[str]) -> str:
-    li = "".join(f"<span class='genre-tag'>{genre}</span>" for genre in genres)
-    return f"""
-    <div class="genre-tags">{li}</div>
-    """
 
+@st.cache_data(ttl=3600, max_entries=1024, show_spinner="Searching...")
+def get_cached_docs(input: str, providers: tuple[str, ...]) -> "list[Document]":
+    # Streamlit reruns the whole script on every widget interaction, so
+    # identical queries would otherwise pay the full retrieval round-trip.
+    # Importing here keeps the heavy LangChain chain off the first paint.
+    from utils.input import get_best_docs
 
-def format_runtime(runtime: int) -> str:
-    hours = runtime // 60
-    minutes = runtime % 60
-    return f"{hours}h {minutes}m"
+    return get_best_docs(input, list(providers))
 
 
 # -- APP --
 
 
 def main():
-    load_dotenv()
+    init_env()
+    warm_weaviate()
     # Initialize search_params and user_input
-    docs = None
     button_input = None
     user_input = None
     load_css("assets/custom.css")
-    unsafe_html(
-        '<script src="https://kit.fontawesome.com/6a637d33a1.js" crossorigin="anonymous"></script>'
-    )
     unsafe_html("<h1 id='title'>🍿 LLMovies</h1>")
     unsafe_html("<p id='subtitle''>Your go-to companion for movie nights</p>")
     with st.sidebar:
@@ -86,7 +103,7 @@ def main():
 
         st.multiselect(
             "Select your streaming services 🎬",
-            [p.value for p in Providers],
+            PROVIDER_VALUES,
             format_func=get_provider_name,
             placeholder="Netflix, Hulu...",
             key="providers",
@@ -94,17 +111,9 @@ def main():
 
 
         st.subheader("Try me out! 🤖", help="Examples do not use the streaming service filter.")
-        q1 = "I'd like to watch a movie about friendship with a rating higher than 7.0."
-        if st.button(q1):
-            button_input = q1
-
-        q2 = "Can you recommend a comedy located in Italy released after 2015.0?"
-        if st.button(q2):
-            button_input = q2
-
-        q3 = "Do you know any thrillers with a rating higher than 8.0 and more than 1000.0 reviews?"
-        if st.button(q3):
-            button_input = q3
+        for preset in PRESET_QUERIES:
+            if st.button(preset):
+                button_input = preset
 
         st.caption(
             "This product uses the TMDB API but is not endorsed or certified by TMDB."
@@ -114,58 +123,47 @@ def main():
         st.warning("Hey! 🌟 Pop in your API key, and let's kick things off!")
         st.stop()
     openai.api_key = openai_key
-    
+    openai.requestssession = get_openai_session()
+
     if st.session_state.providers == []:
         st.warning("👈 Ready to roll? Select your streaming services!")
         st.stop()
     
     default_user_input = button_input if button_input is not None else ""
-    user_input = st.text_input(
-        "Search", value=default_user_input, placeholder="Serch for a topic, a genre ..."
-    )
-    if user_input != "" or button_input is not None:
+    # The form gives the search an explicit submit boundary, so reruns
+    # triggered while typing never reach the retrieval pipeline.
+    with st.form("search_form"):
+        user_input = st.text_input(
+            "Search", value=default_user_input, placeholder="Serch for a topic, a genre ..."
+        )
+        submitted = st.form_submit_button("Search")
+
+    if (submitted and user_input != "") or button_input is not None:
         input = button_input if button_input is not None else user_input
-        try:
-            docs = get_best_docs(input, providers=st.session_state.providers)    
-        except openai.error.AuthenticationError:
-            st.error(
-                "Oops! It seems like your API key took a little detour. 🙃 Double-check and make sure it's the right one, will ya?"
-            )
-            st.stop()
-        except ValueError:
-            st.error(
-                "Oops! 🎈 Let's keep things floaty. Please use floating point numbers (e.g., 10.5) instead of whole integers."
-            )
-            st.stop()
+        query_key = (input, tuple(st.session_state.providers))
+        # Unrelated widget clicks rerun the whole script; only hit the
+        # retrieval pipeline when the query or the providers changed.
+        if st.session_state.get("last_query") != query_key:
+            try:
+                st.session_state.docs = get_cached_docs(*query_key)
+                st.session_state.last_query = query_key
+            except openai.error.AuthenticationError:
+                st.error(
+                    "Oops! It seems like your API key took a little detour. 🙃 Double-check and make sure it's the right one, will ya?"
+                )
+                st.stop()
+            except ValueError:
+                st.error(
+                    "Oops! 🎈 Let's keep things floaty. Please use floating point numbers (e.g., 10.5) instead of whole integers."
+                )
+                st.stop()
+    docs = st.session_state.get("docs")
 
     if docs is not None:
         try:
-            # Renders final recommendations
-            cols = st.columns(3)
-
-            for idx, movie in enumerate(docs):
-                meta = movie.metadata
-                with cols[idx]:
-                    unsafe_html(f"<h3 class='movie-title'>{meta['title']} </h3>")
-                    unsafe_html(
-                        f"""
-                        <ul class="list-inline">
-                        <li>{meta['release_year']}</li>
-                        <li>{format_runtime(meta['runtime'])}</li>
-                        <li><i class="fa-solid fa-star"></i>{meta['imdb_vote_average'] or 0:.1f}/10</li>
-                        </ul>
-                        """
-                    )
-                    show_trailer(meta["trailer_url"])
-                    unsafe_html(genre_tags(meta["genres"]))
-                    unsafe_html(
-                        f"""
-                        <a href="{meta['watch']}" target="_blank" class="rounded-button-link">
-                            <button class="rounded-button">Watch now</button>
-                        </a>
-                        """
-                    )
-                    unsafe_html(f"<div class='truncate'>{movie.page_content}</div>")
+            # Renders final recommendations as a single delta message
+            cards = "".join(movie_card(movie) for movie in docs)
+            unsafe_html(f"<div class='movie-grid'>{cards}</div>")
 
         except LLMoviesOutputError:
             st.write(
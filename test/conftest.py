@@ -0,0 +1,8 @@
+import pytest
+from utils.weaviate_client import get_client
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One client for the whole suite so tests share a keep-alive session.
+    return get_client()
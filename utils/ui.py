@@ -0,0 +1,86 @@
+from functools import lru_cache
+from html import escape
+from typing import TYPE_CHECKING
+
+import streamlit as st
+from utils.enums import Providers
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+
+# Static lookup tables beat Enum.__call__'s per-render scan when the
+# multiselect re-renders on every rerun.
+PROVIDER_NAMES = {p.value: p.name for p in Providers}
+PROVIDER_VALUES = tuple(PROVIDER_NAMES)
+
+
+def unsafe_html(html: str) -> st._DeltaGenerator:
+    return st.markdown(html, unsafe_allow_html=True)
+
+
+def get_provider_name(provider_id: str):
+    return PROVIDER_NAMES[provider_id]
+
+
+def trailer_iframe(video: str | None) -> str:
+    key = video if video else "dQw4w9WgXcQ"
+    return (
+        f"<iframe class='trailer' src='https://www.youtube.com/embed/{key}' "
+        "frameborder='0' allowfullscreen></iframe>"
+    )
+
+
+# Templates are built once at import so the render loop only pays for
+# interpolation, not for re-parsing the HTML skeleton.
+_GENRE_SPAN = "<span class='genre-tag'>{}</span>".format
+
+_CARD_TMPL = """
+    <div class="movie-card">
+        <h3 class='movie-title'>{title}</h3>
+        <ul class="list-inline">
+        <li>{release_year}</li>
+        <li>{runtime}</li>
+        <li><i class="fa-solid fa-star"></i>{rating:.1f}/10</li>
+        </ul>
+        {trailer}
+        {genres}
+        <a href="{watch}" target="_blank" class="rounded-button-link">
+            <button class="rounded-button">Watch now</button>
+        </a>
+        <div class='truncate'>{overview}</div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=256)
+def genre_tags(genres: tuple[str, ...]) -> str:
+    # The same genre sets repeat across movies, so cache the rendered tags.
+    li = "".join(_GENRE_SPAN(escape(genre)) for genre in genres)
+    return f"""
+    <div class="genre-tags">{li}</div>
+    """
+
+
+# Precomputed "1h 32m" strings for the runtimes movies actually have.
+_RUNTIME_STRS = tuple(f"{m // 60}h {m % 60}m" for m in range(400))
+
+
+def format_runtime(runtime: int) -> str:
+    if 0 <= runtime < len(_RUNTIME_STRS):
+        return _RUNTIME_STRS[runtime]
+    return f"{runtime // 60}h {runtime % 60}m"
+
+
+def movie_card(movie: "Document") -> str:
+    meta = movie.metadata
+    return _CARD_TMPL.format(
+        title=meta["title"],
+        release_year=meta["release_year"],
+        runtime=format_runtime(meta["runtime"]),
+        rating=meta["imdb_vote_average"] or 0,
+        trailer=trailer_iframe(meta["trailer_url"]),
+        genres=genre_tags(tuple(meta["genres"])),
+        watch=meta["watch"],
+        overview=movie.page_content,
+    )
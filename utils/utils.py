@@ -1,7 +1,12 @@
 import streamlit as st
 
 
+@st.cache_data(show_spinner=False)
+def _read_css(file_name: str) -> str:
+    with open(file_name) as f:
+        return f.read()
+
+
 def load_css(file_name: str) -> None:
     """Import a CSS file into the Streamlit app."""
-    with open(file_name) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{_read_css(file_name)}</style>", unsafe_allow_html=True)
@@ -1,17 +1,17 @@
 import os
+from functools import lru_cache
 
 import weaviate
 from dotenv import load_dotenv
 
-load_dotenv()
 
-WEAVIATE_URL = os.environ["WEAVIATE_URL"]
-WEAVIATE_KEY = os.environ["WEAVIATE_KEY"]
-OPENAI_KEY = os.environ["OPENAI_API_KEY"]
-
-
-client = weaviate.Client(
-    url=WEAVIATE_URL,
-    auth_client_secret=weaviate.AuthApiKey(WEAVIATE_KEY),
-    additional_headers={"X-OpenAI-Api-Key": OPENAI_KEY},
-)
+@lru_cache(maxsize=None)
+def get_client() -> weaviate.Client:
+    """Build the shared Weaviate client once, on first use."""
+    load_dotenv()
+    return weaviate.Client(
+        url=os.environ["WEAVIATE_URL"],
+        auth_client_secret=weaviate.AuthApiKey(os.environ["WEAVIATE_KEY"]),
+        additional_headers={"X-OpenAI-Api-Key": os.environ["OPENAI_API_KEY"]},
+        timeout_config=(5, 60),
+    )